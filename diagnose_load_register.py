@@ -15,24 +15,13 @@ from __future__ import annotations
 import argparse
 import serial  # type: ignore
 
-
-def crc16(frame: bytes) -> bytes:
-    crc = 0xFFFF
-    for b in frame:
-        crc ^= b
-        for _ in range(8):
-            if crc & 1:
-                crc = (crc >> 1) ^ 0xA001
-            else:
-                crc >>= 1
-    return crc.to_bytes(2, 'little')
+from modbus_crc import crc16, read_reply
 
 
 def read_register(ser: serial.Serial, unit: int, reg: int) -> int | None:
     pdu = bytes([unit & 0xFF, 0x03, reg >> 8, reg & 0xFF, 0x00, 0x01])
     ser.write(pdu + crc16(pdu))
-    ser.flush()
-    resp = ser.read(7)
+    resp = read_reply(ser, 7)
     if len(resp) == 7 and resp[1] == 0x03 and resp[2] == 0x02:
         return (resp[3] << 8) | resp[4]
     return None
@@ -41,8 +30,7 @@ def read_register(ser: serial.Serial, unit: int, reg: int) -> int | None:
 def write_register(ser: serial.Serial, unit: int, reg: int, value: int) -> bool:
     pdu = bytes([unit & 0xFF, 0x06, reg >> 8, reg & 0xFF, value >> 8, value & 0xFF])
     ser.write(pdu + crc16(pdu))
-    ser.flush()
-    resp = ser.read(8)
+    resp = read_reply(ser, 8)
     return len(resp) == 8 and resp[:6] == pdu
 
 
@@ -57,7 +45,7 @@ def main(argv=None):  # noqa: D401
     ap.add_argument('--set', choices=['on', 'off'], help='Write ON or OFF then read back')
     args = ap.parse_args(argv)
 
-    ser = serial.Serial(args.port, 19200, timeout=1)
+    ser = serial.Serial(args.port, 19200, timeout=1, write_timeout=1)
     try:
         if args.read or not args.set:
             val = read_register(ser, args.unit, args.register)
@@ -22,8 +22,9 @@ from bleak import BleakScanner, AdvertisementData
 VICRON_MFG_ID = 0x02E1
 
 
-def _on_advert(device, adv: AdvertisementData):  # type: ignore
-    raw = (adv.manufacturer_data or {}).get(VICRON_MFG_ID)
+def _on_advert(device, adv: AdvertisementData, _ID=VICRON_MFG_ID):  # type: ignore
+    mfg = adv.manufacturer_data
+    raw = mfg.get(_ID) if mfg else None
     if not raw:
         return
     ts = datetime.utcnow().strftime('%H:%M:%S')
@@ -10,14 +10,23 @@ NOTE: To keep dependencies minimal we implement a tiny Modbus RTU write for a si
 holding register (function code 0x06). This avoids pulling in full pymodbus for one write.
 If you prefer robustness, replace `_modbus_write_register` with pymodbus client code.
 
-CRC16 implementation based on standard Modbus polynomial 0xA001.
+CRC16 (standard Modbus polynomial 0xA001) and the header-sized reply reader
+are shared via `modbus_crc.py`.
 
 Bitfield Support:
 If the Modbus register controlling the load output is a bit within a wider
 status/command word rather than a dedicated 0/1 register, you may specify
 `bit_index` (0-15) in the `control.modbus` config. When present:
 * The controller will first read the current value (from `state_register` if
-    set, else from `load_register`).
+    set, else from `load_register`). When that is `load_register` itself the
+    word is cached, so later toggles do the read-modify-write in memory until
+    the cache is older than `_WORD_CACHE_MAX_AGE` or a transaction fails.
+    A cached word is always written (no "already in that state" shortcut),
+    because the device may switch the load on its own (low-voltage disconnect,
+    load algorithm, VictronConnect). Risk: the other 15 bits are written back
+    as they were when cached, so if the device changed them within
+    `_WORD_CACHE_MAX_AGE` the write reverts them. Lower the constant (0
+    disables caching) if other bits of the word are live.
 * It will set or clear the specified bit and write the whole modified word
     back using function 0x06.
 * State is derived from the bit value after a successful write (or a readback
@@ -32,18 +41,11 @@ import serial  # type: ignore
 import time
 from typing import Optional
 from vedirect_control import VEDirectController
+from modbus_crc import crc16 as _modbus_crc, read_reply as _modbus_read_reply
 
-
-def _modbus_crc(frame: bytes) -> bytes:
-    crc = 0xFFFF
-    for b in frame:
-        crc ^= b
-        for _ in range(8):
-            if crc & 1:
-                crc = (crc >> 1) ^ 0xA001
-            else:
-                crc >>= 1
-    return crc.to_bytes(2, "little")
+# Max age (seconds) of the cached bitfield word before a fresh 0x03 read is forced.
+# Writes from the cache restore the other 15 bits as cached (see module docstring).
+_WORD_CACHE_MAX_AGE = 60.0
 
 
 class LoadController:
@@ -65,6 +67,12 @@ class LoadController:
         except Exception:
             # Invalid bit_index -> disable bitfield mode
             self._bit_index = None
+        # Last known word of the bitfield read register (RMW done in memory when fresh)
+        self._cached_word: Optional[int] = None
+        self._cached_word_ts = 0.0
+        # Reused TX buffer: 6-byte PDU + 2-byte CRC, rewritten in place per request
+        self._tx = bytearray(8)
+        self._tx_view = memoryview(self._tx)
 
     def start(self):
         if self.method == "vedirect" and self._vedirect_port:
@@ -109,7 +117,7 @@ class LoadController:
 
     # Modbus minimal ------------------------------------------------------
     def _start_modbus(self):
-        self._modbus_ser = serial.Serial(self._vedirect_port, 19200, timeout=1)
+        self._modbus_ser = serial.Serial(self._vedirect_port, 19200, timeout=1, write_timeout=1)
 
     def _modbus_set(self, desired: bool) -> bool:
         if not self._modbus_ser:
@@ -120,47 +128,56 @@ class LoadController:
         if self._bit_index is not None:
             # Read current word
             base_reg_for_read = int(self._state_register if self._state_register is not None else reg) & 0xFFFF
-            current_word = self._modbus_read_register(base_reg_for_read)
-            if current_word is None:
-                return False
+            # Cache only when the word read is the word written back; a state
+            # register's contents must never be written into the load register
+            cacheable = base_reg_for_read == reg
+            current_word = self._cached_word if cacheable else None
+            from_cache = current_word is not None and (time.monotonic() - self._cached_word_ts) <= _WORD_CACHE_MAX_AGE
+            if not from_cache:
+                current_word = self._modbus_read_register(base_reg_for_read)
+                if current_word is None:
+                    self._invalidate_word()
+                    return False
+                if cacheable:
+                    self._store_word(current_word)
             mask = 1 << self._bit_index
             if desired:
                 new_word = current_word | mask
             else:
                 new_word = current_word & ~mask
-            if new_word == current_word:
-                # No change needed
+            if new_word == current_word and not from_cache:
+                # No change needed (only trusted on a fresh read: the device may have
+                # switched the load itself since the cached word was taken)
                 self._current_state = bool(current_word & mask)
                 self._on_state_update(self.get_state())
                 return True
-            pdu = bytes([unit_id, 0x06, reg >> 8, reg & 0xFF, (new_word >> 8) & 0xFF, new_word & 0xFF])
-            frame = pdu + _modbus_crc(pdu)
+            frame = self._build(unit_id, 0x06, reg, new_word)
             try:
                 self._modbus_ser.write(frame)
-                self._modbus_ser.flush()
-                resp = self._modbus_ser.read(8)
-                if len(resp) == 8 and resp[:6] == pdu:
+                resp = self._modbus_read_resp(8)
+                if len(resp) == 8 and resp[:6] == frame[:6]:
                     # Determine state from resulting word (optimistic if read register differs)
                     if base_reg_for_read == reg:
+                        self._store_word(new_word)
                         self._current_state = bool(new_word & mask)
                     else:
                         self._current_state = self._modbus_read_state()
                     self._on_state_update(self.get_state())
                     return True
             except Exception:
-                return False
+                pass
+            # Timeout / short read / mismatch: next toggle re-reads the device
+            self._invalidate_word()
             return False
         # Direct value strategy --------------------------------------------
         on_value = int(self._modbus_cfg.get("on_value", 1)) & 0xFFFF
         off_value = int(self._modbus_cfg.get("off_value", 0)) & 0xFFFF
         value = on_value if desired else off_value
-        pdu = bytes([unit_id, 0x06, reg >> 8, reg & 0xFF, value >> 8, value & 0xFF])
-        frame = pdu + _modbus_crc(pdu)
+        frame = self._build(unit_id, 0x06, reg, value)
         try:
             self._modbus_ser.write(frame)
-            self._modbus_ser.flush()
-            resp = self._modbus_ser.read(8)
-            if len(resp) == 8 and resp[:6] == pdu:
+            resp = self._modbus_read_resp(8)
+            if len(resp) == 8 and resp[:6] == frame[:6]:
                 if self._state_register is not None:
                     self._current_state = self._modbus_read_state()
                 else:
@@ -178,14 +195,13 @@ class LoadController:
             unit_id = int(self._modbus_cfg.get("unit_id", 1)) & 0xFF
             reg = int(self._state_register) & 0xFFFF
             # Function 0x03 read 1 register
-            pdu = bytes([unit_id, 0x03, reg >> 8, reg & 0xFF, 0x00, 0x01])
-            frame = pdu + _modbus_crc(pdu)
-            self._modbus_ser.write(frame)
-            self._modbus_ser.flush()
-            resp = self._modbus_ser.read(7)  # unit, fc, bytecount, hi, lo, crc_lo, crc_hi
+            self._modbus_ser.write(self._build(unit_id, 0x03, reg, 0x0001))
+            resp = self._modbus_read_resp(7)  # unit, fc, bytecount, hi, lo, crc_lo, crc_hi
             if len(resp) == 7 and resp[1] == 0x03 and resp[2] == 0x02:
                 val = (resp[3] << 8) | resp[4]
                 if self._bit_index is not None:
+                    if reg == int(self._modbus_cfg.get("load_register", 0x0120)) & 0xFFFF:
+                        self._store_word(val)
                     return bool(val & (1 << self._bit_index))
                 else:
                     on_value = int(self._modbus_cfg.get("on_value", 1)) & 0xFFFF
@@ -198,19 +214,47 @@ class LoadController:
             return self._current_state
         return self._current_state
 
+    def _build(self, unit_id: int, fc: int, reg: int, data: int) -> memoryview:
+        """Fill the shared TX buffer with `[unit, fc, reg, data] + CRC` and return a view of it."""
+        tx = self._tx
+        tx[0] = unit_id & 0xFF
+        tx[1] = fc
+        tx[2] = (reg >> 8) & 0xFF
+        tx[3] = reg & 0xFF
+        tx[4] = (data >> 8) & 0xFF
+        tx[5] = data & 0xFF
+        tx[6:8] = _modbus_crc(self._tx_view[:6])
+        return self._tx_view
+
+    def _modbus_read_resp(self, n: int) -> bytes:
+        """Read a reply expected to be `n` bytes (see `modbus_crc.read_reply`)."""
+        ser = self._modbus_ser
+        assert ser is not None
+        return _modbus_read_reply(ser, n)
+
+    def _store_word(self, word: int):
+        self._cached_word = word
+        self._cached_word_ts = time.monotonic()
+
+    def _invalidate_word(self):
+        self._cached_word = None
+
     # Low-level helper to read a single register returning raw 16-bit value
     def _modbus_read_register(self, reg: int) -> Optional[int]:
-        if not self._modbus_ser:
+        words = self._modbus_read_block(reg, 1)
+        return words[0] if words else None
+
+    # Read `count` (1-125) consecutive holding registers in one 0x03 transaction
+    def _modbus_read_block(self, start: int, count: int) -> Optional[list[int]]:
+        if not self._modbus_ser or not (1 <= count <= 125):
             return None
         try:
             unit_id = int(self._modbus_cfg.get("unit_id", 1)) & 0xFF
-            pdu = bytes([unit_id, 0x03, (reg >> 8) & 0xFF, reg & 0xFF, 0x00, 0x01])
-            frame = pdu + _modbus_crc(pdu)
-            self._modbus_ser.write(frame)
-            self._modbus_ser.flush()
-            resp = self._modbus_ser.read(7)
-            if len(resp) == 7 and resp[1] == 0x03 and resp[2] == 0x02:
-                return (resp[3] << 8) | resp[4]
+            self._modbus_ser.write(self._build(unit_id, 0x03, start & 0xFFFF, count))
+            n = 2 * count
+            resp = self._modbus_read_resp(3 + n + 2)  # unit, fc, bytecount, data..., crc_lo, crc_hi
+            if len(resp) == 5 + n and resp[1] == 0x03 and resp[2] == n:
+                return [(resp[i] << 8) | resp[i + 1] for i in range(3, 3 + n, 2)]
         except Exception:
             return None
         return None
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Shared Modbus RTU CRC16 (polynomial 0xA001, init 0xFFFF) and reply reader.
+
+Table-driven (Sarwate) implementation: a 256-entry table is built once at
+import so each byte costs a single lookup instead of 8 shift/xor rounds.
+Used by `load_control.py` and `diagnose_load_register.py`.
+
+If `modbus_crc_fast.so` (built from `modbus_crc_fast.c`, slice-by-8) sits next
+to this module it is loaded via ctypes and `crc16` uses it; otherwise the
+pure-Python table path is used. Call sites are identical either way.
+
+`crc16_bulk` computes CRCs for many equal-length PDUs at once (bulk register
+scan tools). It needs numpy, which is optional and not in requirements.txt; it
+is imported on first call so importing this module never loads numpy.
+
+`read_reply` reads one RTU reply off a pyserial port, sized from its header.
+"""
+from __future__ import annotations
+
+import ctypes
+import os
+
+_POLY = 0xA001
+# Timeout for the rest of a reply once its header arrived. A full frame here is
+# <10 bytes (~5 ms at 19200 baud); padded for USB-serial latency (FTDI ~16 ms).
+# pyserial's inter_byte_timeout cannot do this on Linux (VTIME is whole
+# deciseconds, and read() waits for all requested bytes anyway).
+TAIL_TIMEOUT = 0.1
+
+
+def _compute(i: int) -> int:
+    crc = i
+    for _ in range(8):
+        if crc & 1:
+            crc = (crc >> 1) ^ _POLY
+        else:
+            crc >>= 1
+    return crc
+
+
+CRC16_TBL = tuple(_compute(i) for i in range(256))
+
+
+def _load_fast():
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "modbus_crc_fast.so")
+    if not os.path.exists(path):
+        return None
+    try:
+        fn = ctypes.CDLL(path).crc16_slice8
+    except (OSError, AttributeError):
+        return None
+    fn.restype = ctypes.c_uint16
+    fn.argtypes = [ctypes.c_char_p, ctypes.c_size_t]
+    return fn
+
+
+_crc16_fast = _load_fast()
+
+
+def _crc16_py(frame: bytes | bytearray | memoryview) -> bytes:
+    """Return the 2-byte little-endian Modbus CRC of `frame`."""
+    crc = 0xFFFF
+    tbl = CRC16_TBL
+    for b in frame:
+        crc = (crc >> 8) ^ tbl[(crc ^ b) & 0xFF]
+    return crc.to_bytes(2, "little")
+
+
+def _crc16_c(frame: bytes | bytearray | memoryview) -> bytes:
+    """Same result as `_crc16_py`, computed by the slice-by-8 C library."""
+    data = frame if type(frame) is bytes else bytes(frame)
+    return _crc16_fast(data, len(data)).to_bytes(2, "little")  # type: ignore[misc]
+
+
+crc16 = _crc16_c if _crc16_fast is not None else _crc16_py
+
+
+def read_reply(ser, n: int) -> bytes:
+    """Read a reply expected to be `n` bytes, sized from its own header.
+
+    Waits up to the port timeout for unit + function code only. An exception
+    reply (fc & 0x80) is 5 bytes; 0x03/0x04 carry a byte count. The tail is
+    read with `TAIL_TIMEOUT`, so a transaction is bounded by ~timeout + 0.1 s.
+    Returns whatever arrived; callers check the length and CRC.
+    """
+    head = ser.read(2)
+    if len(head) < 2:
+        return head
+    timeout = ser.timeout
+    ser.timeout = TAIL_TIMEOUT
+    try:
+        fc = head[1]
+        if fc & 0x80:
+            return head + ser.read(3)  # exception code + CRC
+        if fc in (0x03, 0x04):
+            count = ser.read(1)
+            if not count:
+                return head
+            return head + count + ser.read(count[0] + 2)
+        return head + ser.read(n - 2)
+    finally:
+        ser.timeout = timeout
+
+
+_NP_TBL = None
+
+
+def crc16_bulk(frames):
+    """Vectorized CRC16 for an (N, L) uint8 array of equal-length PDUs.
+
+    Returns an (N,) uint16 array of CRC values (low byte first on the wire).
+    All N CRCs advance one column per numpy op instead of a Python loop per byte.
+    """
+    global _NP_TBL
+    try:
+        import numpy as np  # type: ignore  # lazy: keeps numpy out of the bridge process
+    except ImportError:
+        raise RuntimeError("numpy not installed; crc16_bulk unavailable") from None
+    if _NP_TBL is None:
+        _NP_TBL = np.array(CRC16_TBL, dtype=np.uint16)
+    frames = np.asarray(frames, dtype=np.uint8)
+    if frames.ndim != 2:
+        raise ValueError("frames must be a 2-D (N, L) array")
+    crc = np.full(frames.shape[0], 0xFFFF, dtype=np.uint16)
+    for j in range(frames.shape[1]):
+        idx = (crc ^ frames[:, j]).astype(np.uint8)
+        crc = (crc >> 8) ^ _NP_TBL[idx]
+    return crc
+
+
+__all__ = ["CRC16_TBL", "TAIL_TIMEOUT", "crc16", "crc16_bulk", "read_reply"]
@@ -0,0 +1,47 @@
+/*
+ * Optional slice-by-8 Modbus RTU CRC16 (polynomial 0xA001, init 0xFFFF).
+ *
+ * Loaded by modbus_crc.py through ctypes when the shared library is present;
+ * otherwise the pure-Python table version is used. Build on the Pi with:
+ *
+ *   cc -O2 -shared -fPIC -o modbus_crc_fast.so modbus_crc_fast.c
+ *
+ * Tables T[0..7] let the main loop consume 8 bytes per iteration; an 8-byte
+ * Modbus frame is a single iteration with no tail.
+ */
+#include <stddef.h>
+#include <stdint.h>
+
+static uint16_t T[8][256];
+static int tables_ready = 0;
+
+static void build_tables(void)
+{
+    for (int i = 0; i < 256; i++) {
+        uint16_t crc = (uint16_t)i;
+        for (int k = 0; k < 8; k++)
+            crc = (crc & 1) ? (uint16_t)((crc >> 1) ^ 0xA001) : (uint16_t)(crc >> 1);
+        T[0][i] = crc;
+    }
+    for (int i = 0; i < 256; i++)
+        for (int t = 1; t < 8; t++)
+            T[t][i] = (uint16_t)((T[t - 1][i] >> 8) ^ T[0][T[t - 1][i] & 0xFF]);
+    tables_ready = 1;
+}
+
+uint16_t crc16_slice8(const uint8_t *p, size_t n)
+{
+    uint16_t crc = 0xFFFF;
+    if (!tables_ready)
+        build_tables();
+    while (n >= 8) {
+        crc = (uint16_t)(T[7][(p[0] ^ crc) & 0xFF] ^ T[6][(p[1] ^ (crc >> 8)) & 0xFF] ^
+                         T[5][p[2]] ^ T[4][p[3]] ^ T[3][p[4]] ^ T[2][p[5]] ^
+                         T[1][p[6]] ^ T[0][p[7]]);
+        p += 8;
+        n -= 8;
+    }
+    while (n--)
+        crc = (uint16_t)((crc >> 8) ^ T[0][(crc ^ *p++) & 0xFF]);
+    return crc;
+}
@@ -1,11 +1,21 @@
 import openpyxl, json, re
-wb=openpyxl.load_workbook('CCGX-Modbus-TCP-register-list-3.60.xlsx', data_only=True)
+wb=openpyxl.load_workbook('CCGX-Modbus-TCP-register-list-3.60.xlsx', read_only=True, data_only=True)
 rows=[]
-pattern=re.compile(r'load', re.IGNORECASE)
+KEYWORDS=('load',)
+try:
+    # Optional: pyahocorasick scans once per cell regardless of keyword count
+    import ahocorasick
+    _A=ahocorasick.Automaton()
+    for kw in KEYWORDS: _A.add_word(kw, kw)
+    _A.make_automaton()
+    def hit(c): return next(_A.iter(c.lower()), None) is not None
+except ImportError:
+    pattern=re.compile('|'.join(map(re.escape, KEYWORDS)), re.IGNORECASE)
+    hit=pattern.search
 for ws in wb.worksheets:
     for r in ws.iter_rows(values_only=True):
         if not r: continue
-        if any(isinstance(c,str) and pattern.search(c) for c in r):
+        if any(isinstance(c,str) and hit(c) for c in r):
             rows.append([c for c in r if c is not None])
 print('WORKSHEETS', [w.title for w in wb.worksheets])
 print('MATCHES', len(rows))
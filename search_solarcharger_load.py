@@ -1,15 +1,14 @@
 import openpyxl, re
-wb=openpyxl.load_workbook('CCGX-Modbus-TCP-register-list-3.60.xlsx', data_only=True)
+wb=openpyxl.load_workbook('CCGX-Modbus-TCP-register-list-3.60.xlsx', read_only=True, data_only=True)
 pat1=re.compile('solarcharger', re.I)
 pat2=re.compile('load', re.I)
 rows=[]
 for ws in wb.worksheets:
     for r in ws.iter_rows(values_only=True):
         if not r: continue
-        cells=[str(c) for c in r if c is not None]
-        joined=' '.join(cells)
-        if pat1.search(joined) and pat2.search(joined):
-            rows.append(cells)
+        cells=[c for c in r if isinstance(c, str)]
+        if any(pat1.search(c) for c in cells) and any(pat2.search(c) for c in cells):
+            rows.append([c for c in r if c is not None])
 print('TOTAL MATCHES', len(rows))
 for r in rows[:50]:
     print(r)
@@ -36,7 +36,6 @@ class VEDirectController:
         self._thread: Optional[threading.Thread] = None
         self._stop = threading.Event()
         self._last_frame: Dict[str, str] = {}
-        self._lock = threading.Lock()
         self._last_load_state: Optional[bool] = None
 
     def start(self):
@@ -67,8 +66,8 @@ class VEDirectController:
         return self._write_load(False)
 
     def get_last_frame(self) -> Dict[str, str]:
-        with self._lock:
-            return dict(self._last_frame)
+        """Return the latest frame dict. Treat as read-only: it is shared, not copied."""
+        return self._last_frame
 
     def get_load_state(self) -> Optional[bool]:
         return self._last_load_state
@@ -76,24 +75,27 @@ class VEDirectController:
     # Internal -------------------------------------------------------------
     def _reader_loop(self):
         buf: Dict[str, str] = {}
+        pending = b""
         assert self._ser is not None
         while not self._stop.is_set():
             try:
-                line_b = self._ser.readline()
-                if not line_b:
+                # Read whatever is queued (blocking for >=1 byte) instead of
+                # pyserial's byte-at-a-time readline(); split lines ourselves.
+                chunk = self._ser.read(self._ser.in_waiting or 1)
+                if not chunk:
                     # timeout
                     continue
-                line = line_b.decode(errors="ignore").strip()
-                if not line:
-                    continue
-                if '\t' in line:
-                    k, v = line.split('\t', 1)
-                    if k == 'Checksum':
-                        # Frame end
+                *lines, pending = (pending + chunk).split(b'\n')
+                for line_b in lines:
+                    k_b, sep, v_b = line_b.strip().partition(b'\t')
+                    if not sep:
+                        continue
+                    if k_b == b'Checksum':
+                        # Frame end (checksum byte itself is binary; never decoded)
                         self._process_frame(buf)
                         buf = {}
                     else:
-                        buf[k] = v
+                        buf[k_b.decode('ascii', 'ignore')] = v_b.decode('ascii', 'ignore')
             except Exception:
                 time.sleep(0.5)
         # flush last partial
@@ -109,10 +111,11 @@ class VEDirectController:
                 if val in ("on", "1", "yes"): load_state = True
                 elif val in ("off", "0", "no"): load_state = False
                 break
-        with self._lock:
-            self._last_frame = frame
-            if load_state is not None:
-                self._last_load_state = load_state
+        # Each frame is a fresh dict never mutated after this point, so plain
+        # (individually atomic) attribute rebinds replace the former lock.
+        self._last_frame = frame
+        if load_state is not None:
+            self._last_load_state = load_state
         if self.on_frame:
             try:
                 self.on_frame(frame)
@@ -9,30 +9,44 @@ Features:
 * Optional derived metrics (basic power in Watts)
 * Unknown device passive discovery (optional)
 * Per-device availability & bridge stats publishing
+* BLE decryption offloaded to a thread-pool executor (event loop stays responsive)
 * Optional Prometheus metrics exporter
 * Optional MQTT TLS
+* Compact JSON via orjson when installed (stdlib json fallback)
+* Optional state-only publishing (`mqtt.per_metric_topics: false`): one JSON
+  message per advert instead of N+1. Cuts broker packets / TLS cost on slow
+  links, but per-metric thresholds no longer apply and consumers (HA sensors
+  included) must read `<base>/<name>/state` via a JSON value template.
 
 Limitations: BLE Instant Readout is read-only (no control / load toggling).
 """
 
 from __future__ import annotations
 import asyncio
+import copy
+import heapq
 import json
 import logging
+import os
 import signal
+import socketserver
 import sys
 import time
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, Optional, Tuple
 
 import yaml
+try:
+    from yaml import CSafeLoader as _YamlLoader  # libyaml C parser
+except ImportError:  # PyYAML built without libyaml; warned about below
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
 from bleak import BleakScanner, AdvertisementData
 from paho.mqtt.client import Client as MQTTClient
 import threading
 from http.server import BaseHTTPRequestHandler, HTTPServer
-from functools import partial
+from functools import lru_cache, partial
 from vedirect_control import VEDirectController  # backward compatibility (legacy)
 from load_control import LoadController
-from datetime import datetime, timedelta
+from datetime import date
 try:
     from astral import LocationInfo
     from astral.sun import sun
@@ -41,6 +55,24 @@ except ImportError:  # astral optional; only needed if sunrise_sunset enabled
     def sun(*a, **k):  # type: ignore
         return {}
 
+try:
+    import orjson  # type: ignore
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:  # orjson optional; stdlib json fallback (same compact output)
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+try:
+    import msgspec  # type: ignore
+
+    _json_encode = msgspec.json.encode
+    _json_decode = msgspec.json.decode
+except ImportError:  # msgspec optional; config sidecar cache then uses json
+    _json_encode = _dumps
+    _json_decode = json.loads
+
 try:
     from victron_ble import parse_advertisement as _parse_advertisement  # type: ignore
 except ImportError:
@@ -52,32 +84,150 @@ if _parse_advertisement is None:
     except Exception:
         detect_device_type = None  # type: ignore
 
+    # adv_key -> (parser instance, type name); each key belongs to one device whose
+    # type never changes, so detection + parser construction happen once per device
+    _PARSERS: Dict[bytes, Tuple[Any, str]] = {}
+
     def parse_frame(raw: bytes, adv_key: bytes):  # type: ignore
-        if detect_device_type is None:
-            raise RuntimeError("victron_ble API not available")
-        parser_cls = detect_device_type(raw)
-        parser = parser_cls(adv_key)
-        values = parser.parse(raw)
-        return {"device_type": getattr(parser_cls, "__name__", "unknown"), "values": values}
+        entry = _PARSERS.get(adv_key)
+        if entry is None:
+            if detect_device_type is None:
+                raise RuntimeError("victron_ble API not available")
+            parser_cls = detect_device_type(raw)
+            entry = _PARSERS[adv_key] = (parser_cls(adv_key), getattr(parser_cls, "__name__", "unknown"))
+        parser, type_name = entry
+        return {"device_type": type_name, "values": parser.parse(raw)}
 else:
     def parse_frame(raw: bytes, adv_key: bytes):  # type: ignore
         return _parse_advertisement(raw, adv_key=adv_key)  # type: ignore
 
 LOGGER = logging.getLogger("victron_bridge")
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+if _YamlLoader is yaml.SafeLoader:
+    LOGGER.warning("libyaml not available; config parsed with the pure-Python YAML loader")
+# Evaluated once: guards debug logging on the per-advert path
+_DEBUG = LOGGER.isEnabledFor(logging.DEBUG)
 
 VICRON_MFG_ID = 0x02E1
+# Bound on adverts waiting for the consumer; beyond this new adverts are dropped
+_ADVERT_QUEUE_MAX = 1024
+# <name>/rssi is republished when RSSI moves to another bucket of this many dB,
+# or after _RSSI_REFRESH_SECONDS regardless
+_RSSI_BUCKET_DB = 3
+_RSSI_REFRESH_SECONDS = 30.0
+
+# HA sensor metadata: (unit, device_class, state_class)
+_METRIC_CLASS_EXACT = {
+    "voltage": ("V", "voltage", "measurement"),
+    "current": ("A", "current", "measurement"),
+    "amps": ("A", "current", "measurement"),
+    "current_a": ("A", "current", "measurement"),
+    "power": ("W", "power", "measurement"),
+    "watts": ("W", "power", "measurement"),
+    "temperature": ("°C", "temperature", "measurement"),
+    "temp": ("°C", "temperature", "measurement"),
+    "soc": ("%", "battery", "measurement"),
+}
+_METRIC_CLASS_SUFFIX = (
+    ("_v", ("V", "voltage", "measurement")),
+    ("_a", ("A", "current", "measurement")),
+    ("_w", ("W", "power", "measurement")),
+    ("_alarm", (None, "problem", None)),
+)
+_METRIC_CLASS_DEFAULT = (None, None, "measurement")
+# A device's HA discovery set is treated as final after this long without a new metric
+_HA_STABLE_SECONDS = 60.0
+
+
+# Sun scheduler day math on epoch seconds: UTC day n starts at n * _SECS_PER_DAY
+_SECS_PER_DAY = 86400
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_SUN_REPLAN_AFTER_MIDNIGHT = 300  # replan at 00:05 UTC
+
+# HA load switch discovery: static fields fixed here; None slots (kept for key
+# order) are filled per bridge in _ha_publish_switch
+_LOAD_SWITCH_TEMPLATE: Dict[str, Any] = {
+    "name": None,
+    "unique_id": None,
+    "command_topic": None,
+    "state_topic": None,
+    "payload_on": "ON",
+    "payload_off": "OFF",
+    "availability": None,
+    "device": None,
+}
+_LOAD_SWITCH_DEVICE_TEMPLATE: Dict[str, Any] = {
+    "identifiers": None,
+    "manufacturer": "Victron",
+    "name": None,
+    "model": "VE.Direct Controlled Load",
+}
+
+
+# Prometheus exporter: static HELP/TYPE header per metric, rendered once at import.
+# Order must match the values tuple in VictronBridge._prometheus_metrics_text.
+_PROM_METRICS = (
+    ("victron_bridge_uptime_seconds", "gauge", "Bridge uptime in seconds"),
+    ("victron_bridge_adverts_seen", "counter", "Total BLE adverts observed"),
+    ("victron_bridge_messages_published", "counter", "MQTT messages published"),
+    ("victron_bridge_throttled_skipped", "counter", "Frames skipped by whole-dict throttle"),
+    ("victron_bridge_duplicates_skipped", "counter", "Identical raw adverts dropped before parsing"),
+    ("victron_bridge_metric_suppressed", "counter", "Metrics suppressed by delta thresholds"),
+    ("victron_bridge_known_devices", "gauge", "Configured devices"),
+    ("victron_bridge_unknown_devices", "gauge", "Observed unknown devices"),
+    ("victron_bridge_load_actions", "counter", "Load control actions executed"),
+    ("victron_bridge_load_state", "gauge", "Current load state (1=on,0=off,-1=unknown)"),
+)
+_PROM_HEADERS = tuple(
+    (name, f"# HELP {name} {help_}\n# TYPE {name} {type_}\n") for name, type_, help_ in _PROM_METRICS
+)
+_PROM_CACHE_SECONDS = 1.0
+# Raw HTTP/1.0 replies for the socket-level exporter (see _start_prometheus)
+_PROM_200 = b"HTTP/1.0 200 OK\r\nContent-Type: text/plain; version=0.0.4\r\nContent-Length: %d\r\nConnection: close\r\n\r\n"
+_PROM_404 = b"HTTP/1.0 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n"
+
+
+@lru_cache(maxsize=256)
+def _classify_metric(metric: str):
+    ml = metric.lower()
+    hit = _METRIC_CLASS_EXACT.get(ml)
+    if hit is not None:
+        return hit
+    for suffix, cls in _METRIC_CLASS_SUFFIX:
+        if ml.endswith(suffix):
+            return cls
+    return _METRIC_CLASS_DEFAULT
+
+
+def _parse_jobs(jobs: list) -> list:
+    """Executor-side batch decrypt; a failing frame yields its exception instead."""
+    out: list = []
+    for job in jobs:
+        try:
+            out.append(parse_frame(job[2], job[1]["key"]))
+        except Exception as exc:
+            out.append(exc)
+    return out
 
 
 class VictronBridge:
     def __init__(self, cfg: Dict[str, Any]) -> None:
         self.cfg = cfg
         self.mqtt: Optional[MQTTClient] = None
-        self.device_map: Dict[str, Dict[str, str]] = {
-            mac.upper(): {"name": v["name"], "key": v["adv_key"]}
+        # adv_key decoded once here; invalid hex fails fast at startup
+        self.device_map: Dict[str, Dict[str, Any]] = {
+            mac.upper(): {"name": v["name"], "key": bytes.fromhex(v["adv_key"])}
             for mac, v in cfg["victron"]["devices"].items()
         }
         self.base = cfg["mqtt"]["base_topic"].rstrip("/")
+        self._per_metric_topics = bool(cfg["mqtt"].get("per_metric_topics", True))
+        # Per-device topic strings built once (metric topics filled lazily on first sight)
+        for dev in self.device_map.values():
+            dev["topic_prefix"] = f"{self.base}/{dev['name']}"
+            dev["state_topic"] = f"{dev['topic_prefix']}/state"
+            dev["availability_topic"] = f"{dev['topic_prefix']}/availability"
+            dev["rssi_topic"] = f"{dev['topic_prefix']}/rssi"
+            dev["metric_topics"] = {}
         self._stop = asyncio.Event()
         bridge_cfg = cfg.get("bridge", {})
         self._throttle_seconds = float(bridge_cfg.get("throttle_seconds", 5.0))
@@ -85,6 +235,8 @@ class VictronBridge:
         self._publish_unknown = bool(bridge_cfg.get("publish_unknown_devices", False))
         self._unknown_topic = bridge_cfg.get("unknown_topic", f"{self.base}/unknown")
         self._device_timeout = float(bridge_cfg.get("device_timeout_seconds", 120.0))
+        # Identical raw adverts are dropped before parsing; re-parse after this many seconds (0 disables dedup)
+        self._dedup_refresh = float(bridge_cfg.get("dedup_refresh_seconds", 60.0))
         self._stats_interval = float(bridge_cfg.get("stats_interval_seconds", 60.0))
         # Config extras
         self._per_metric_thresholds = {
@@ -96,21 +248,44 @@ class VictronBridge:
 
         # State
         self._last_values: Dict[str, Dict[str, Any]] = {}
+        self._last_values_hash: Dict[str, int] = {}  # hash of raw advert behind the last publish
         self._last_metric_values: Dict[str, Dict[str, Any]] = {}
-        self._last_publish_ts: Dict[str, float] = {}
+        self._last_publish_ts: Dict[str, float] = {}  # time.monotonic()
         self._ha_announced: Dict[str, set] = {}
+        # Devices whose metric set has not grown for _HA_STABLE_SECONDS: the per-advert
+        # discovery check is skipped (Victron models emit a fixed key set)
+        self._ha_stable: set[str] = set()
+        self._ha_changed_ts: Dict[str, float] = {}
+        self._ha_device_fragment: Dict[str, Dict[str, Any]] = {}
         self._unknown_devices: Dict[str, Dict[str, Any]] = {}
-        self._device_last_seen: Dict[str, float] = {}
+        self._device_last_seen: Dict[str, float] = {}  # time.monotonic(); wall clock derived on render
         self._device_available: Dict[str, bool] = {}
+        # (expiry, mac) per available device; stale entries re-pushed on pop
+        self._expiry_heap: list[tuple[float, str]] = []
         self._device_last_rssi: Dict[str, int] = {}
+        # Guards device state dicts read by the web UI thread (held only briefly)
+        self._state_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._advert_queue: Optional[asyncio.Queue] = None  # created in start() on the running loop
+        self._advert_task: Optional[asyncio.Task] = None
+        self._pending_publishes: list[tuple[str, Any, bool]] = []
+        self._last_raw: Dict[str, bytes] = {}
+        self._last_raw_ts: Dict[str, float] = {}
+        # Per MAC: last published RSSI bucket and when <name>/rssi last went out
+        self._rssi_bucket: Dict[str, int] = {}
+        self._last_rssi_pub_ts: Dict[str, float] = {}
+        # Per device name: (voltage_key, current_key) used for derived power_w
+        self._derived_key_cache: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
         # Stats
-        self._start_time = time.time()
+        self._start_time = time.monotonic()
         self._messages_published = 0
         self._throttled_skipped = 0
+        self._duplicates_skipped = 0
         self._metric_suppressed = 0
         self._adverts_seen = 0
         self._maint_task: Optional[asyncio.Task] = None
-        self._prom_server: Optional[HTTPServer] = None
+        self._prom_server: Optional[socketserver.ThreadingTCPServer] = None
+        self._prom_cache: tuple[float, bytes] = (float("-inf"), b"")
         self._prom_thread: Optional[threading.Thread] = None
         self._web_server: Optional[HTTPServer] = None
         self._web_thread: Optional[threading.Thread] = None
@@ -118,13 +293,44 @@ class VictronBridge:
         control_cfg = cfg.get("control", {})
         self._control_enabled = bool(control_cfg.get("enabled", False))
         self._control_device_name = control_cfg.get("control_device_name", "controller")
+        # Fixed for the bridge's lifetime: build the topic strings once
+        self._topic_bridge_state = f"{self.base}/bridge/state"
+        self._topic_bridge_stats = f"{self.base}/bridge/stats"
+        self._topic_load_cmd = f"{self.base}/{self._control_device_name}/load/command"
+        self._topic_load_state = f"{self.base}/{self._control_device_name}/load/state"
+        self._topic_discovery_load = f"homeassistant/switch/{self._control_device_name}_load_switch/config"
         self._vedirect_port = control_cfg.get("vedirect_port")
+        self._control_method = control_cfg.get("method", "vedirect")
+        self._control_modbus_cfg = control_cfg.get("modbus", {})
         self._load_controller: Optional[LoadController] = None
         self._load_state: Optional[bool] = None
         self._load_actions = 0
         self._sun_cfg = control_cfg.get("sunrise_sunset", {})
+        # Parsed once; _sun_lat None => invalid location, scheduler refuses to start
+        self._sun_on_rise = bool(self._sun_cfg.get("on_at_sunrise", True))
+        self._sun_off_set = bool(self._sun_cfg.get("off_at_sunset", True))
+        self._sun_lat: Optional[float] = None
+        self._sun_lon: Optional[float] = None
+        self._sun_rise_off = 0.0  # seconds
+        self._sun_set_off = 0.0
+        try:
+            self._sun_rise_off = 60.0 * int(self._sun_cfg.get("sunrise_offset_min", 0))
+            self._sun_set_off = 60.0 * int(self._sun_cfg.get("sunset_offset_min", 0))
+            self._sun_lat = float(self._sun_cfg.get("latitude"))
+            self._sun_lon = float(self._sun_cfg.get("longitude"))
+        except (TypeError, ValueError):
+            if self._sun_cfg.get("enabled"):
+                LOGGER.error("Invalid latitude/longitude or offsets for sunrise/sunset")
         self._sun_task: Optional[asyncio.Task] = None
+        # Sun scheduler -> _load_cmd_worker handoff (latest command wins)
+        self._pending_cmd: Optional[bool] = None
+        self._cmd_event = asyncio.Event()
+        self._cmd_task: Optional[asyncio.Task] = None
         self._next_sun_events: Dict[str, float] = {}
+        # (utc_day_number, sunrise_ts, sunset_ts) from astral for the current UTC day (epoch seconds)
+        self._sun_cache: Optional[Tuple[int, Optional[float], Optional[float]]] = None
+        # Armed loop.call_at timers for today's sun events + the next-day replan
+        self._sun_handles: list[asyncio.TimerHandle] = []
 
     # MQTT
     def _mqtt_connect(self):
@@ -132,7 +338,7 @@ class VictronBridge:
         client = MQTTClient(client_id="victron_ble_bridge", clean_session=True)
         if cfg.get("username"):
             client.username_pw_set(cfg["username"], cfg.get("password", ""))
-        client.will_set(f"{self.base}/bridge/state", "offline", retain=True)
+        client.will_set(self._topic_bridge_state, "offline", retain=True)
         # TLS (optional)
         tls_cfg = cfg.get("tls") or {}
         if tls_cfg.get("enabled"):
@@ -147,19 +353,17 @@ class VictronBridge:
                 LOGGER.error("Failed to configure MQTT TLS: %s", exc)
         client.connect(cfg["host"], cfg.get("port", 1883), keepalive=60)
         client.loop_start()
-        client.publish(f"{self.base}/bridge/state", "online", retain=True)
+        client.publish(self._topic_bridge_state, "online", retain=True)
         self.mqtt = client
         LOGGER.info("Connected to MQTT at %s:%s", cfg["host"], cfg.get("port", 1883))
         # Subscribe to control command topic if enabled
         if self._control_enabled:
-            cmd_topic = f"{self.base}/{self._control_device_name}/load/command"
+            cmd_topic = self._topic_load_cmd
             def on_msg(client, userdata, msg):  # noqa: ANN001
                 try:
                     payload = msg.payload.decode().strip().upper()
                     if payload in ("ON", "OFF"):
-                        asyncio.get_event_loop().call_soon_threadsafe(
-                            lambda: asyncio.create_task(self._apply_load_command(payload == "ON"))
-                        )
+                        asyncio.run_coroutine_threadsafe(self._apply_load_command(payload == "ON"), self._loop)  # type: ignore[arg-type]
                 except Exception:
                     pass
             client.on_message = on_msg
@@ -169,40 +373,45 @@ class VictronBridge:
     def _mqtt_pub(self, topic: str, payload: Any, retain: bool = True):
         if not self.mqtt:
             return
-        data = payload if isinstance(payload, (str, bytes)) else json.dumps(payload, separators=(",", ":"))
+        data = payload if isinstance(payload, (str, bytes, bytearray)) else _dumps(payload)
         self.mqtt.publish(topic, data, retain=retain)
         self._messages_published += 1
 
-    # HA discovery
+    # Per-advert batching: payloads are encoded as queued, then handed to Paho
+    # in one tight loop by _flush_publishes() at the end of the advert.
+    def _queue_pub(self, topic: str, payload: Any, retain: bool = True):
+        data = payload if isinstance(payload, (str, bytes, bytearray)) else _dumps(payload)
+        self._pending_publishes.append((topic, data, retain))
+
+    def _queue_pub_raw(self, topic: str, data: str | bytes, retain: bool = True):
+        """Queue a ready-to-send str/bytes payload (no type check or serialization)."""
+        self._pending_publishes.append((topic, data, retain))
+
+    def _flush_publishes(self):
+        pending = self._pending_publishes
+        if not pending:
+            return
+        self._pending_publishes = []
+        if not self.mqtt:
+            return
+        publish = self.mqtt.publish
+        for topic, data, retain in pending:
+            publish(topic, data, retain=retain)
+        self._messages_published += len(pending)
+
+    # HA discovery: payloads are queued and go out with the caller's batch flush
+    # (end of the advert batch, or once at startup for the load switch)
     def _ha_discovery_publish(self, name: str, values: Dict[str, Any]):
         if not self._ha_enabled:
             return
         announced = self._ha_announced.setdefault(name, set())
-        for metric, val in values.items():
-            if metric in announced:
-                continue
-            ml = metric.lower()
-            unit = device_class = state_class = None
-            state_class = "measurement"
-            if ml in ("voltage",) or ml.endswith("_v"):
-                unit = "V"; device_class = "voltage"
-            elif ml in ("current", "amps", "current_a") or ml.endswith("_a"):
-                unit = "A"; device_class = "current"
-            elif ml in ("power", "watts") or ml.endswith("_w"):
-                unit = "W"; device_class = "power"
-            elif ml in ("temperature", "temp"):
-                unit = "°C"; device_class = "temperature"
-            elif ml == "soc":
-                unit = "%"; device_class = "battery"
-            elif ml.endswith("_alarm"):
-                device_class = "problem"; state_class = None
-            uniq = f"{name}_{metric}".lower()
-            payload = {
-                "name": f"{name} {metric}",
-                "state_topic": f"{self.base}/{name}/{metric}",
-                "unique_id": uniq,
+        # availability + device blocks are identical for every metric of a device:
+        # built once and shared by reference across its discovery payloads
+        frag = self._ha_device_fragment.get(name)
+        if frag is None:
+            frag = self._ha_device_fragment[name] = {
                 "availability": [
-                    {"topic": f"{self.base}/bridge/state"},
+                    {"topic": self._topic_bridge_state},
                     {"topic": f"{self.base}/{name}/availability"}
                 ],
                 "device": {
@@ -212,77 +421,72 @@ class VictronBridge:
                     "model": "Victron Smart Device",
                 },
             }
-            if unit:
-                payload["unit_of_measurement"] = unit
-            if device_class:
-                payload["device_class"] = device_class
-            if state_class:
-                payload["state_class"] = state_class
-            self._mqtt_pub(f"homeassistant/sensor/{uniq}/config", payload)
+        for metric, val in values.items():
+            if metric in announced:
+                continue
+            unit, device_class, state_class = _classify_metric(metric)
+            uniq = f"{name}_{metric}".lower()
+            payload = {
+                "name": f"{name} {metric}",
+                "state_topic": f"{self.base}/{name}/{metric}",
+                "unique_id": uniq,
+                **frag,
+            }
+            payload.update({k: v for k, v in (
+                ("unit_of_measurement", unit), ("device_class", device_class), ("state_class", state_class),
+            ) if v})
+            if not self._per_metric_topics:
+                payload["state_topic"] = f"{self.base}/{name}/state"
+                payload["value_template"] = f"{{{{ value_json['values']['{metric}'] }}}}"
+            self._queue_pub(f"homeassistant/sensor/{uniq}/config", payload)
             announced.add(metric)
 
     async def _maintenance_loop(self):
         try:
             while not self._stop.is_set():
                 await asyncio.sleep(self._stats_interval)
-                now = time.time()
-                for mac, last in list(self._device_last_seen.items()):
-                    dev = self.device_map.get(mac)
-                    if not dev:
-                        continue
-                    name = dev["name"]
-                    alive = (now - last) <= self._device_timeout
-                    if self._device_available.get(mac) and not alive:
-                        self._mqtt_pub(f"{self.base}/{name}/availability", "offline")
-                        self._device_available[mac] = False
-                stats = {
-                    "uptime_s": int(now - self._start_time),
-                    "adverts_seen": self._adverts_seen,
-                    "messages_published": self._messages_published,
-                    "throttled_skipped": self._throttled_skipped,
-                    "metric_suppressed": self._metric_suppressed,
-                    "known_devices": len(self.device_map),
-                    "unknown_devices": len(self._unknown_devices),
-                    "load_actions": self._load_actions,
-                    "load_state": None if self._load_state is None else (1 if self._load_state else 0),
-                }
-                self._mqtt_pub(f"{self.base}/bridge/stats", stats)
+                now = time.monotonic()
+                heap = self._expiry_heap
+                while heap and heap[0][0] <= now:
+                    _, mac = heapq.heappop(heap)
+                    last = self._device_last_seen[mac]
+                    if (now - last) <= self._device_timeout:
+                        # Seen since this entry was pushed; re-arm at its real expiry
+                        heapq.heappush(heap, (last + self._device_timeout, mac))
+                    elif self._device_available.get(mac):
+                        self._mqtt_pub(self.device_map[mac]["availability_topic"], "offline")
+                        with self._state_lock:
+                            self._device_available[mac] = False
+                self._mqtt_pub(self._topic_bridge_stats, self._current_stats())
         except asyncio.CancelledError:
             pass
 
     # Prometheus exporter -------------------------------------------------
     def _prometheus_metrics_text(self) -> str:
-        now = time.time()
-        lines = [
-            "# HELP victron_bridge_uptime_seconds Bridge uptime in seconds",
-            "# TYPE victron_bridge_uptime_seconds gauge",
-            f"victron_bridge_uptime_seconds {{}} {int(now - self._start_time)}",
-            "# HELP victron_bridge_adverts_seen Total BLE adverts observed",
-            "# TYPE victron_bridge_adverts_seen counter",
-            f"victron_bridge_adverts_seen {{}} {self._adverts_seen}",
-            "# HELP victron_bridge_messages_published MQTT messages published",
-            "# TYPE victron_bridge_messages_published counter",
-            f"victron_bridge_messages_published {{}} {self._messages_published}",
-            "# HELP victron_bridge_throttled_skipped Frames skipped by whole-dict throttle",
-            "# TYPE victron_bridge_throttled_skipped counter",
-            f"victron_bridge_throttled_skipped {{}} {self._throttled_skipped}",
-            "# HELP victron_bridge_metric_suppressed Metrics suppressed by delta thresholds",
-            "# TYPE victron_bridge_metric_suppressed counter",
-            f"victron_bridge_metric_suppressed {{}} {self._metric_suppressed}",
-            "# HELP victron_bridge_known_devices Configured devices",
-            "# TYPE victron_bridge_known_devices gauge",
-            f"victron_bridge_known_devices {{}} {len(self.device_map)}",
-            "# HELP victron_bridge_unknown_devices Observed unknown devices",
-            "# TYPE victron_bridge_unknown_devices gauge",
-            f"victron_bridge_unknown_devices {{}} {len(self._unknown_devices)}",
-            "# HELP victron_bridge_load_actions Load control actions executed",
-            "# TYPE victron_bridge_load_actions counter",
-            f"victron_bridge_load_actions {{}} {self._load_actions}",
-            "# HELP victron_bridge_load_state Current load state (1=on,0=off,-1=unknown)",
-            "# TYPE victron_bridge_load_state gauge",
-            f"victron_bridge_load_state {{}} { -1 if self._load_state is None else (1 if self._load_state else 0)}",
-        ]
-        return "\n".join(lines) + "\n"
+        now = time.monotonic()
+        values = (
+            int(now - self._start_time),
+            self._adverts_seen,
+            self._messages_published,
+            self._throttled_skipped,
+            self._duplicates_skipped,
+            self._metric_suppressed,
+            len(self.device_map),
+            len(self._unknown_devices),
+            self._load_actions,
+            -1 if self._load_state is None else (1 if self._load_state else 0),
+        )
+        return "".join(f"{head}{name} {{}} {val}\n" for (name, head), val in zip(_PROM_HEADERS, values))
+
+    def _prometheus_metrics_bytes(self) -> bytes:
+        """Rendered /metrics body, regenerated at most once per _PROM_CACHE_SECONDS."""
+        now = time.monotonic()
+        ts, data = self._prom_cache
+        if now - ts < _PROM_CACHE_SECONDS:
+            return data
+        data = self._prometheus_metrics_text().encode()
+        self._prom_cache = (now, data)
+        return data
 
     def _start_prometheus(self):
         if self._prom_port <= 0:
@@ -290,21 +494,26 @@ class VictronBridge:
 
         bridge_ref = self
 
-        class Handler(BaseHTTPRequestHandler):  # type: ignore
-            def do_GET(self):  # noqa: N802
-                if self.path != "/metrics":
-                    self.send_response(404); self.end_headers(); return
-                data = bridge_ref._prometheus_metrics_text().encode()
-                self.send_response(200)
-                self.send_header("Content-Type", "text/plain; version=0.0.4")
-                self.send_header("Content-Length", str(len(data)))
-                self.end_headers()
-                self.wfile.write(data)
-            def log_message(self, format, *args):  # noqa: A003 - silence
-                return
+        # Scrapes are machine-driven: no header parsing, one recv + one sendall
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                try:
+                    line = self.request.recv(1024).split(b"\r\n", 1)[0]
+                    parts = line.split(b" ", 2)
+                    if len(parts) < 2 or parts[0] != b"GET" or parts[1].split(b"?", 1)[0] != b"/metrics":
+                        self.request.sendall(_PROM_404)
+                        return
+                    data = bridge_ref._prometheus_metrics_bytes()
+                    self.request.sendall(_PROM_200 % len(data) + data)
+                except OSError:
+                    pass
+
+        class Server(socketserver.ThreadingTCPServer):
+            allow_reuse_address = True
+            daemon_threads = True
 
         try:
-            server = HTTPServer(("0.0.0.0", self._prom_port), Handler)
+            server = Server(("0.0.0.0", self._prom_port), Handler)
         except Exception as exc:  # pragma: no cover
             LOGGER.error("Failed to start Prometheus server: %s", exc)
             return
@@ -317,12 +526,13 @@ class VictronBridge:
     # ------------------- Built-in Web UI (optional) --------------------
     def _current_stats(self) -> Dict[str, Any]:
         """Snapshot of current stats (mirrors MQTT bridge/stats)."""
-        now = time.time()
+        now = time.monotonic()
         return {
             "uptime_s": int(now - self._start_time),
             "adverts_seen": self._adverts_seen,
             "messages_published": self._messages_published,
             "throttled_skipped": self._throttled_skipped,
+            "duplicates_skipped": self._duplicates_skipped,
             "metric_suppressed": self._metric_suppressed,
             "known_devices": len(self.device_map),
             "unknown_devices": len(self._unknown_devices),
@@ -331,7 +541,7 @@ class VictronBridge:
         }
 
     def _json(self, handler: BaseHTTPRequestHandler, code: int, obj: Any):  # type: ignore
-        data = json.dumps(obj, separators=(",", ":")).encode()
+        data = _dumps(obj)
         handler.send_response(code)
         handler.send_header("Content-Type", "application/json")
         handler.send_header("Content-Length", str(len(data)))
@@ -410,22 +620,26 @@ refresh(); setInterval(refresh,3000);
                     bridge_ref._json(self, 200, bridge_ref._current_stats()); return
                 if path == '/api/devices':
                     devices = []
-                    for mac, info in bridge_ref.device_map.items():
-                        name = info['name']
-                        devices.append({
-                            'name': name,
-                            'mac': mac,
-                            'available': bool(bridge_ref._device_available.get(mac)),
-                            'last_seen': int(bridge_ref._device_last_seen.get(mac, 0)) or None,
-                            'rssi': bridge_ref._device_last_rssi.get(mac),
-                            'values': bridge_ref._last_values.get(name, {})
-                        })
-                    for mac, u in bridge_ref._unknown_devices.items():
-                        devices.append({
-                            'name': '(unknown)', 'mac': mac, 'available': True,
-                            'last_seen': int(u.get('last_seen', 0)) or None,
-                            'rssi': None, 'values': {}
-                        })
+                    wall_offset = time.time() - time.monotonic()
+                    # Snapshot under the lock (shallow copies); serialize after release
+                    with bridge_ref._state_lock:
+                        for mac, info in bridge_ref.device_map.items():
+                            name = info['name']
+                            last = bridge_ref._device_last_seen.get(mac)
+                            devices.append({
+                                'name': name,
+                                'mac': mac,
+                                'available': bool(bridge_ref._device_available.get(mac)),
+                                'last_seen': int(last + wall_offset) if last else None,
+                                'rssi': bridge_ref._device_last_rssi.get(mac),
+                                'values': dict(bridge_ref._last_values.get(name, {}))
+                            })
+                        for mac, u in bridge_ref._unknown_devices.items():
+                            devices.append({
+                                'name': '(unknown)', 'mac': mac, 'available': True,
+                                'last_seen': int(u.get('last_seen', 0)) or None,
+                                'rssi': None, 'values': {}
+                            })
                     bridge_ref._json(self, 200, devices); return
                 if path == '/api/load':
                     state = 'UNKNOWN'
@@ -434,7 +648,7 @@ refresh(); setInterval(refresh,3000);
                     bridge_ref._json(self, 200, {
                         'enabled': bridge_ref._control_enabled,
                         'state': state,
-                        'method': bridge_ref.cfg.get('control', {}).get('method', 'vedirect')
+                        'method': bridge_ref._control_method
                     }); return
                 self.send_response(404); self.end_headers()
             def do_POST(self):  # noqa: N802
@@ -448,9 +662,7 @@ refresh(); setInterval(refresh,3000);
                         desired = data.get('state','').upper()
                         if desired not in ('ON','OFF'):
                             raise ValueError('state must be ON/OFF')
-                        asyncio.get_event_loop().call_soon_threadsafe(
-                            lambda: asyncio.create_task(bridge_ref._apply_load_command(desired=='ON'))
-                        )
+                        asyncio.run_coroutine_threadsafe(bridge_ref._apply_load_command(desired=='ON'), bridge_ref._loop)  # type: ignore[arg-type]
                         bridge_ref._json(self, 200, {'ok': True})
                     except Exception as exc:  # pragma: no cover
                         bridge_ref._json(self, 400, {'error': str(exc)})
@@ -469,6 +681,8 @@ refresh(); setInterval(refresh,3000);
         LOGGER.info('Web UI listening on :%s', self._web_ui_port)
 
     async def start(self):
+        # Captured before MQTT/web threads exist; they schedule load commands onto it
+        self._loop = asyncio.get_running_loop()
         self._mqtt_connect()
         self._start_prometheus()
         self._start_web_ui()
@@ -476,101 +690,213 @@ refresh(); setInterval(refresh,3000);
             self._start_load_controller()
             self._publish_load_state()
             self._ha_publish_switch()
+            self._flush_publishes()
             if self._sun_cfg.get("enabled"):
+                self._cmd_task = asyncio.create_task(self._load_cmd_worker())
                 self._sun_task = asyncio.create_task(self._sun_scheduler())
-        loop = asyncio.get_running_loop()
+        loop = self._loop
         for sig in (signal.SIGINT, signal.SIGTERM):
             loop.add_signal_handler(sig, self._stop.set)
         self._maint_task = asyncio.create_task(self._maintenance_loop())
-        async with BleakScanner(self._on_advert, detection_duplicates=True):
+        self._advert_queue = asyncio.Queue(maxsize=_ADVERT_QUEUE_MAX)
+        self._advert_task = asyncio.create_task(self._advert_consumer())
+        async with BleakScanner(self._on_victron_advert, detection_duplicates=True):
             LOGGER.info("Scanning for Victron BLE advertisements...")
             await self._stop.wait()
             LOGGER.info("Shutting down scanner...")
         if self.mqtt:
-            self._mqtt_pub(f"{self.base}/bridge/state", "offline", retain=True)
+            self._mqtt_pub(self._topic_bridge_state, "offline", retain=True)
             self.mqtt.loop_stop(); self.mqtt.disconnect()
         if self._maint_task:
             self._maint_task.cancel()
+        if self._advert_task:
+            self._advert_task.cancel()
         if self._prom_server:
             self._prom_server.shutdown()
         if self._web_server:
             self._web_server.shutdown()
         if self._sun_task:
             self._sun_task.cancel()
+        if self._cmd_task:
+            self._cmd_task.cancel()
         if self._load_controller:
             self._load_controller.stop()
 
-    def _on_advert(self, device, adv: AdvertisementData):
-        mac = device.address.upper()
-        mfg = adv.manufacturer_data or {}
-        raw = mfg.get(VICRON_MFG_ID)
+    def _on_victron_advert(self, device, adv: AdvertisementData, _ID=VICRON_MFG_ID):
+        mfg = adv.manufacturer_data
+        raw = mfg.get(_ID) if mfg else None
         if not raw:
             return
         self._adverts_seen += 1
-        dev_cfg = self.device_map.get(mac)
-        if not dev_cfg:
-            if self._publish_unknown:
-                now = time.time()
-                info = self._unknown_devices.setdefault(mac, {"first_seen": now, "count": 0})
-                info["count"] += 1; info["last_seen"] = now
-                self._mqtt_pub(f"{self._unknown_topic}/{mac}/state", {
-                    "mac": mac, "rssi": adv.rssi, "last_seen": int(now), "count": info["count"]
-                })
-                self._mqtt_pub(f"{self._unknown_topic}/{mac}/raw", raw.hex())
-            return
         try:
-            parsed = parse_frame(raw, adv_key=bytes.fromhex(dev_cfg["key"]))
+            self._advert_queue.put_nowait((device.address, adv.rssi, raw, time.monotonic()))  # type: ignore[union-attr]
+        except asyncio.QueueFull:
+            pass  # consumer behind; Victron adverts repeat, nothing lost for long
+
+    async def _advert_consumer(self):
+        """Drain all queued adverts per wake-up (BlueZ delivers bursts), decrypt the
+        batch in one executor hop, then flush every resulting publish at once."""
+        queue = self._advert_queue
+        assert queue is not None
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                jobs = self._filter_batch(batch)
+                if jobs:
+                    results = await loop.run_in_executor(None, _parse_jobs, jobs)
+                    for job, parsed in zip(jobs, results):
+                        if isinstance(parsed, Exception):
+                            if _DEBUG:
+                                LOGGER.debug("Parse fail for %s: %s", job[0], parsed)
+                            continue
+                        self._publish_parsed(*job, parsed)
+            except Exception as exc:
+                if _DEBUG:
+                    LOGGER.debug("Advert batch failed: %s", exc)
+            finally:
+                self._flush_publishes()
+
+    def _filter_batch(self, batch: list) -> list:
+        """Unknown-device publish, dedup and throttle for a batch of queued adverts.
+
+        Returns parse jobs `(mac, dev_cfg, raw, rssi, now)`, keeping only the
+        newest advert per MAC so a burst costs one decryption per device.
+        """
+        jobs: Dict[str, tuple] = {}
+        for address, rssi, raw, now in batch:
+            mac = address.upper()
+            dev_cfg = self.device_map.get(mac)
+            if not dev_cfg:
+                if self._publish_unknown:
+                    wall = time.time()  # wall clock: published as last_seen
+                    with self._state_lock:
+                        info = self._unknown_devices.setdefault(mac, {"first_seen": wall, "count": 0})
+                        info["count"] += 1; info["last_seen"] = wall
+                    self._queue_pub(f"{self._unknown_topic}/{mac}/state", {
+                        "mac": mac, "rssi": rssi, "last_seen": int(wall), "count": info["count"]
+                    })
+                    self._queue_pub(f"{self._unknown_topic}/{mac}/raw", raw.hex())
+                continue
+            # Same encrypted payload as last accepted => same values; skip parse/publish
+            # but keep availability fresh. Re-parse after _dedup_refresh so the
+            # throttle heartbeat still refreshes retained topics. A device marked
+            # offline always goes through so _publish_parsed re-announces it.
+            available = self._device_available.get(mac)
+            if self._dedup_refresh > 0:
+                if available and self._last_raw.get(mac) == raw and (now - self._last_raw_ts[mac]) < self._dedup_refresh:
+                    self._duplicates_skipped += 1
+                    with self._state_lock:
+                        self._device_last_seen[mac] = now
+                        self._device_last_rssi[mac] = rssi
+                    self._maybe_queue_rssi(mac, dev_cfg, rssi, now)
+                    continue
+                self._last_raw[mac] = raw; self._last_raw_ts[mac] = now
+            # Whole-frame throttle on the raw payload hash: unchanged raw => unchanged
+            # values, so skip before paying for decryption or a dict compare (never
+            # while offline, so the online transition isn't delayed by the throttle)
+            if self._throttle_seconds > 0 and available:
+                name = dev_cfg["name"]
+                if hash(raw) == self._last_values_hash.get(name) and (now - self._last_publish_ts[name]) < self._throttle_seconds:
+                    self._throttled_skipped += 1
+                    with self._state_lock:
+                        self._device_last_seen[mac] = now
+                        self._device_last_rssi[mac] = rssi
+                    self._maybe_queue_rssi(mac, dev_cfg, rssi, now)
+                    continue
+            jobs[mac] = (mac, dev_cfg, raw, rssi, now)
+        return list(jobs.values())
+
+    def _maybe_queue_rssi(self, mac: str, dev_cfg: Dict[str, Any], rssi: int, now: float):
+        """RSSI jitters every packet: sibling topic, only on a bucket change or refresh.
+
+        Called for parsed, deduplicated and throttled adverts alike, so the topic
+        tracks the radio even while the values (and their publishes) are unchanged.
+        """
+        bucket = rssi // _RSSI_BUCKET_DB * _RSSI_BUCKET_DB
+        if bucket != self._rssi_bucket.get(mac) or (now - self._last_rssi_pub_ts[mac]) >= _RSSI_REFRESH_SECONDS:
+            self._rssi_bucket[mac] = bucket; self._last_rssi_pub_ts[mac] = now
+            self._queue_pub_raw(dev_cfg["rssi_topic"], _dumps(rssi))
+
+    def _publish_parsed(self, mac: str, dev_cfg: Dict[str, Any], raw: bytes, rssi: int, now: float, parsed: Dict[str, Any]):
+        """Queue publishes for one decoded advert. `now` is its time.monotonic() arrival stamp."""
+        try:
             name = dev_cfg["name"]
-            topic_prefix = f"{self.base}/{name}"
+            topic_prefix = dev_cfg["topic_prefix"]
+            metric_topics = dev_cfg["metric_topics"]
             values: Dict[str, Any] = parsed.get("values", {})
             # Derived metrics (basic)
             if self._derive_basic and "power_w" not in values:
-                # Attempt to find voltage & current keys
-                v_key = "voltage" if "voltage" in values else next((k for k in values if k.endswith("_v")), None)  # type: ignore[arg-type]
-                c_key = "current" if "current" in values else next((k for k in values if k.endswith("_a")), None)  # type: ignore[arg-type]
-                try:
-                    if v_key and c_key:
+                # Voltage & current key names are stable per device: find them once
+                keys = self._derived_key_cache.get(name)
+                if keys is None:
+                    v_key = "voltage" if "voltage" in values else next((k for k in values if k.endswith("_v")), None)  # type: ignore[arg-type]
+                    c_key = "current" if "current" in values else next((k for k in values if k.endswith("_a")), None)  # type: ignore[arg-type]
+                    keys = self._derived_key_cache[name] = (v_key, c_key)
+                v_key, c_key = keys
+                if v_key and c_key:
+                    try:
                         v_val = float(values[v_key]); c_val = float(values[c_key])
                         values["power_w"] = round(v_val * c_val, 2)
-                except Exception:  # ignore bad casts
-                    pass
-            self._device_last_seen[mac] = time.time()
-            self._device_last_rssi[mac] = adv.rssi
-            if not self._device_available.get(mac):
-                self._device_available[mac] = True
-                self._mqtt_pub(f"{topic_prefix}/availability", "online")
-            if self._throttle_seconds > 0:
-                now = time.time(); prev = self._last_values.get(name)
-                if prev == values and (now - self._last_publish_ts.get(name, 0)) < self._throttle_seconds:
-                    self._throttled_skipped += 1; return
-                self._last_values[name] = values; self._last_publish_ts[name] = now
-            if name not in self._ha_announced:
-                self._ha_discovery_publish(name, values)
-            else:
-                new_vals = {k: v for k, v in values.items() if k not in self._ha_announced[name]}
-                if new_vals:
-                    self._ha_discovery_publish(name, new_vals)
-            # Per-metric thresholds (suppress minor deltas)
-            metric_last = self._last_metric_values.setdefault(name, {})
-            for k, v in values.items():
-                publish_metric = True
-                thr = self._per_metric_thresholds.get(k)
-                if thr is not None and k in metric_last:
-                    try:
-                        delta = abs(float(v) - float(metric_last[k]))
-                        if delta < thr:
-                            publish_metric = False
-                            self._metric_suppressed += 1
-                    except Exception:
+                    except Exception:  # ignore bad casts / key missing from this frame
                         pass
-                if publish_metric:
-                    self._mqtt_pub(f"{topic_prefix}/{k}", v)
+            with self._state_lock:
+                self._device_last_seen[mac] = now
+                self._device_last_rssi[mac] = rssi
+                came_online = not self._device_available.get(mac)
+                if came_online:
+                    self._device_available[mac] = True
+                self._last_values[name] = values
+            if came_online:
+                heapq.heappush(self._expiry_heap, (now + self._device_timeout, mac))
+                self._queue_pub(dev_cfg["availability_topic"], "online")
+            if self._throttle_seconds > 0:
+                self._last_values_hash[name] = hash(raw); self._last_publish_ts[name] = now
+            if self._ha_enabled and name not in self._ha_stable:
+                announced = self._ha_announced.get(name)
+                if announced is None:
+                    self._ha_discovery_publish(name, values)
+                    self._ha_changed_ts[name] = now
+                elif not (values.keys() <= announced):
+                    # Steady state (all keys announced) costs one C-level subset check
+                    new_keys = values.keys() - announced
+                    self._ha_discovery_publish(name, {k: values[k] for k in new_keys})
+                    self._ha_changed_ts[name] = now
+                elif now - self._ha_changed_ts[name] >= _HA_STABLE_SECONDS:
+                    self._ha_stable.add(name)
+            # Per-metric topics + thresholds (suppress minor deltas); skipped in state-only mode
+            if self._per_metric_topics:
+                metric_last = self._last_metric_values.setdefault(name, {})
+                queue_raw = self._queue_pub_raw
+                thresholds = self._per_metric_thresholds
+                for k, v in values.items():
+                    thr = thresholds.get(k)
+                    if thr is not None:
+                        prev = metric_last.get(k)
+                        if prev is not None:
+                            if type(v) is float and type(prev) is float:
+                                delta = v - prev if v >= prev else prev - v
+                            else:
+                                try:
+                                    delta = abs(float(v) - float(prev))
+                                except Exception:  # non-numeric: never suppressed
+                                    delta = thr
+                            if delta < thr:
+                                self._metric_suppressed += 1
+                                continue
+                    topic = metric_topics.get(k) or metric_topics.setdefault(k, f"{topic_prefix}/{k}")
+                    # Metric values are scalars: str as-is, numbers/bools encode straight to bytes
+                    queue_raw(topic, v if type(v) is str else _dumps(v))
                     metric_last[k] = v
-            self._mqtt_pub(f"{topic_prefix}/state", {
-                "mac": mac, "rssi": adv.rssi, "type": parsed.get("device_type"), "values": values,
+            self._queue_pub(dev_cfg["state_topic"], {
+                "mac": mac, "type": parsed.get("device_type"), "values": values,
             })
+            self._maybe_queue_rssi(mac, dev_cfg, rssi, now)
         except Exception as exc:
-            LOGGER.debug("Parse fail for %s: %s", mac, exc)
+            if _DEBUG:
+                LOGGER.debug("Publish fail for %s: %s", mac, exc)
 
     # ---------------- Control / Load Output -----------------
     def _start_load_controller(self):
@@ -580,9 +906,8 @@ refresh(); setInterval(refresh,3000);
                 self._load_state = new_state
                 self._publish_load_state()
         try:
-            method = self.cfg.get("control", {}).get("method", "vedirect")
-            modbus_cfg = self.cfg.get("control", {}).get("modbus", {})
-            self._load_controller = LoadController(method, self._vedirect_port, modbus_cfg, on_state_update)
+            method = self._control_method
+            self._load_controller = LoadController(method, self._vedirect_port, self._control_modbus_cfg, on_state_update)
             self._load_controller.start()
             LOGGER.info("Load controller started (%s) on %s", method, self._vedirect_port)
         except Exception as exc:
@@ -591,9 +916,8 @@ refresh(); setInterval(refresh,3000);
     def _publish_load_state(self):
         if not self.mqtt or not self._control_enabled:
             return
-        state_topic = f"{self.base}/{self._control_device_name}/load/state"
         val = "UNKNOWN" if self._load_state is None else ("ON" if self._load_state else "OFF")
-        self._mqtt_pub(state_topic, val)
+        self._mqtt_pub(self._topic_load_state, val)
 
     async def _apply_load_command(self, desired: bool):
         if not self._load_controller:
@@ -613,73 +937,154 @@ refresh(); setInterval(refresh,3000);
     def _ha_publish_switch(self):
         if not self._ha_enabled or not self.mqtt:
             return
-        uniq = f"{self._control_device_name}_load_switch"
-        payload = {
-            "name": f"{self._control_device_name} load",
-            "unique_id": uniq,
-            "command_topic": f"{self.base}/{self._control_device_name}/load/command",
-            "state_topic": f"{self.base}/{self._control_device_name}/load/state",
-            "payload_on": "ON",
-            "payload_off": "OFF",
-            "availability": [
-                {"topic": f"{self.base}/bridge/state"},
-            ],
-            "device": {
-                "identifiers": [f"victron_load_{self._control_device_name}"],
-                "manufacturer": "Victron",
-                "name": self._control_device_name,
-                "model": "VE.Direct Controlled Load",
-            },
-        }
-        self._mqtt_pub(f"homeassistant/switch/{uniq}/config", payload)
+        payload = dict(_LOAD_SWITCH_TEMPLATE)
+        payload["name"] = f"{self._control_device_name} load"
+        payload["unique_id"] = f"{self._control_device_name}_load_switch"
+        payload["command_topic"] = self._topic_load_cmd
+        payload["state_topic"] = self._topic_load_state
+        payload["availability"] = [{"topic": self._topic_bridge_state}]
+        device = dict(_LOAD_SWITCH_DEVICE_TEMPLATE)
+        device["identifiers"] = [f"victron_load_{self._control_device_name}"]
+        device["name"] = self._control_device_name
+        payload["device"] = device
+        self._queue_pub(self._topic_discovery_load, payload)
+
+    def _fire_load_command(self, desired: bool) -> None:
+        """Hand a scheduled command to `_load_cmd_worker`: a field write, no Task per event."""
+        self._pending_cmd = desired
+        self._cmd_event.set()
+
+    async def _load_cmd_worker(self):
+        """Apply commands posted by `_fire_load_command`; only the newest pending one runs."""
+        try:
+            while True:
+                await self._cmd_event.wait()
+                self._cmd_event.clear()
+                desired, self._pending_cmd = self._pending_cmd, None
+                if desired is not None:
+                    await self._apply_load_command(desired)
+        except asyncio.CancelledError:
+            pass
 
     async def _sun_scheduler(self):
         if LocationInfo is None:
             LOGGER.error("Astral not installed; sunrise/sunset disabled")
             return
-        try:
-            lat = float(self._sun_cfg.get("latitude"))
-            lon = float(self._sun_cfg.get("longitude"))
-        except Exception:
-            LOGGER.error("Invalid latitude/longitude for sunrise/sunset")
-            return
-        on_at_sunrise = bool(self._sun_cfg.get("on_at_sunrise", True))
-        off_at_sunset = bool(self._sun_cfg.get("off_at_sunset", True))
-        rise_off = int(self._sun_cfg.get("sunrise_offset_min", 0))
-        set_off = int(self._sun_cfg.get("sunset_offset_min", 0))
-        location = LocationInfo(latitude=lat, longitude=lon)
-        while not self._stop.is_set():
-            now = datetime.utcnow()
-            s = sun(location.observer, date=now.date())
-            # Astral returns aware datetimes (UTC if observer has no tz)
-            sunrise = (s.get("sunrise") or now) + timedelta(minutes=rise_off)
-            sunset = (s.get("sunset") or now) + timedelta(minutes=set_off)
-            # Determine next events
-            events: list[tuple[datetime, Callable[[], None]]] = []
-            if on_at_sunrise and sunrise > now:
-                events.append((sunrise, lambda: asyncio.create_task(self._apply_load_command(True))))
-            if off_at_sunset and sunset > now:
-                events.append((sunset, lambda: asyncio.create_task(self._apply_load_command(False))))
-            if not events:
-                # All for today passed; sleep until a bit after midnight UTC
-                tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=5, second=0, microsecond=0)
-                await asyncio.sleep((tomorrow - now).total_seconds())
-                continue
-            events.sort(key=lambda x: x[0])
-            next_time, action = events[0]
-            wait_s = max(1, (next_time - now).total_seconds())
+        if self._sun_lat is None or self._sun_lon is None:
+            return  # invalid config, already logged in __init__
+        on_at_sunrise, off_at_sunset = self._sun_on_rise, self._sun_off_set
+        rise_off, set_off = self._sun_rise_off, self._sun_set_off
+        observer = LocationInfo(latitude=self._sun_lat, longitude=self._sun_lon).observer
+        loop = asyncio.get_running_loop()
+        fire_on = partial(self._fire_load_command, True)
+        fire_off = partial(self._fire_load_command, False)
+        handles = self._sun_handles
+        # Bound once: the closure reads cells instead of module globals / attributes
+        sun_fn = sun
+        wall_now = time.time
+        call_at = loop.call_at
+        loop_now = loop.time
+        from_ordinal = date.fromordinal
+
+        def plan_day():
+            """Arm one loop timer per remaining event today, plus one for tomorrow's replan."""
+            handles.clear()  # everything armed earlier has fired by now
+            # Wall-clock epoch floats throughout; a date object only to feed astral
+            now_ts = wall_now()
+            base = loop_now() - now_ts  # epoch -> loop clock
+            day = int(now_ts) // _SECS_PER_DAY  # UTC day number (epoch has no leap seconds)
+            handles.append(call_at(base + (day + 1) * _SECS_PER_DAY + _SUN_REPLAN_AFTER_MIDNIGHT, plan_day))
             try:
-                await asyncio.wait_for(self._stop.wait(), timeout=wait_s)
-                break
-            except asyncio.TimeoutError:
-                action()  # fire
-                # loop recalculates for potential second event
+                cache = self._sun_cache
+                if cache is None or cache[0] != day:
+                    # solar geometry: once per UTC day; only astral needs a date object
+                    s = sun_fn(observer, date=from_ordinal(day + _EPOCH_ORDINAL))
+                    rise_dt, set_dt = s.get("sunrise"), s.get("sunset")
+                    cache = self._sun_cache = (
+                        day,
+                        rise_dt.timestamp() if rise_dt else None,
+                        set_dt.timestamp() if set_dt else None,
+                    )
+            except Exception as exc:  # e.g. polar day/night; retry tomorrow
+                LOGGER.error("Sunrise/sunset calculation failed: %s", exc)
+                return
+            _, rise_ts, set_ts = cache
+            sunrise = (rise_ts or now_ts) + rise_off
+            sunset = (set_ts or now_ts) + set_off
+            if on_at_sunrise and sunrise > now_ts:
+                handles.append(call_at(base + sunrise, fire_on))
+            if off_at_sunset and sunset > now_ts:
+                handles.append(call_at(base + sunset, fire_off))
+
+        plan_day()
+        try:
+            await self._stop.wait()
+        finally:
+            for handle in handles:
+                handle.cancel()
+            handles.clear()
         LOGGER.info("Sun scheduler exiting")
 
+# abspath -> ((st_mtime_ns, st_size, st_ino), parsed config)
+_CFG_CACHE: Dict[str, Tuple[Tuple[int, int, int], Dict[str, Any]]] = {}
+_CFG_CACHE_LOCK = threading.Lock()
+
 
 def load_config(path: str) -> Dict[str, Any]:
-    with open(path, "r", encoding="utf-8") as fh:
-        return yaml.safe_load(fh)
+    """Parse the YAML config; repeat loads of an unchanged file skip the parser.
+
+    Callers get a deep copy, so mutating the result never leaks into the cache.
+    """
+    key = os.path.abspath(path)
+    st = os.stat(key)
+    sig = (st.st_mtime_ns, st.st_size, st.st_ino)
+    with _CFG_CACHE_LOCK:
+        entry = _CFG_CACHE.get(key)
+        if entry is None or entry[0] != sig:
+            entry = _CFG_CACHE[key] = (sig, _read_config(key, sig, st.st_mode & 0o777))
+        return copy.deepcopy(entry[1])
+
+
+def _read_config(path: str, sig: Tuple[int, int, int], mode: int) -> Dict[str, Any]:
+    """YAML parse, short-circuited by a JSON sidecar (`<path>.cache`) across restarts.
+
+    The sidecar records the YAML's (mtime_ns, size) so any edit invalidates it,
+    even on filesystems with coarse timestamps. Written only if the config
+    round-trips through JSON unchanged; unwritable directories are ignored.
+    The sidecar holds the same secrets (MQTT password, adv_keys) as the YAML, so
+    it is created with the YAML's permission bits (`mode`), never the umask default.
+    """
+    cache_path = path + ".cache"
+    stamp = [sig[0], sig[1]]
+    try:
+        with open(cache_path, "rb") as fh:
+            cached = _json_decode(fh.read())
+        if cached.get("sig") == stamp:
+            return cached["cfg"]
+    except Exception:  # missing, stale format or corrupt: reparse
+        pass
+    with open(path, "rb") as fh:
+        raw = fh.read()
+    # Whole raw buffer in one go: libyaml decodes UTF-8 (BOM-aware) and scans it in C
+    cfg = yaml.load(raw, Loader=_YamlLoader)
+    try:
+        data = _json_encode({"sig": stamp, "cfg": cfg})
+        if _json_decode(data)["cfg"] == cfg:
+            tmp = f"{cache_path}.{os.getpid()}.tmp"
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, mode)
+            try:
+                with os.fdopen(fd, "wb") as fh:
+                    fh.write(data)
+                os.replace(tmp, cache_path)
+            except BaseException:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                raise
+    except Exception as exc:
+        LOGGER.debug("Config cache not written: %s", exc)
+    return cfg
 
 
 def main() -> int: